@@ -1,14 +1,305 @@
+import asyncio
+import codecs
+import json
+import os
 import re
+import sqlite3
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from urllib.parse import quote, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-from PyPDF2 import PdfReader
+import aiohttp
+import fitz
 from fpdf import FPDF
+from selectolax.parser import HTMLParser
 import time
 import logging
 
 
+# Minimum seconds between requests to the same host, following the published API rate limits
+HOST_DELAYS = {
+    'arxiv.org': 3.0,
+    'api.crossref.org': 1.0,
+    'api.semanticscholar.org': 1.0,
+}
+DEFAULT_HOST_DELAY = 0.5
+
+# Semantic Scholar resolves up to 500 DOIs/arXiv IDs per batch request
+SEMANTIC_BATCH_URL = 'https://api.semanticscholar.org/graph/v1/paper/batch?fields=title,abstract'
+SEMANTIC_BATCH_SIZE = 500
+
+# HTML parsing moves to a process pool when this many sources need scraping
+PARSE_POOL_THRESHOLD = 50
+
+# Webpages are only read this far when looking for a title or abstract; both sit near the top
+MAX_HTML_BYTES = 65536
+
+# Encoding declared in a page's <meta charset> or <meta http-equiv="Content-Type"> tag
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([-\w.:]+)', re.IGNORECASE)
+
+# Successful responses are kept on disk so repeated runs skip the network
+CACHE_PATH = 'spark_cache.sqlite'
+CACHE_EXPIRE_AFTER = 7 * 24 * 60 * 60  # seconds
+
+_DOI_RE = re.compile(r'10\.\d{4,9}/[-._;()/:A-Za-z0-9]+')
+
+# Links, DOIs and arXiv IDs in a single pass; the first alternative that matches wins
+_SOURCE_RE = re.compile(
+    r'(?P<link>https?://\S+)'  # Basic HTTP/HTTPS links
+    r'|(?P<www>www\.\S+)'  # Links starting with www
+    r'|(?P<doi_link>doi\.org/\S+)'  # DOI links
+    rf'|(?P<doi>{_DOI_RE.pattern})'  # Bare DOIs
+    r'|(?P<arxiv>arXiv:\d{4}\.\d{4,5})'  # arXiv IDs
+)
+
+# arXiv IDs and DOIs embedded in URLs (including arXiv's own DOIs)
+_ARXIV_URL_RE = re.compile(r'(?:arxiv\.org/(?:abs|pdf)/|10\.48550/arxiv\.)(\d{4}\.\d{4,5})', re.IGNORECASE)
+_DOI_URL_RE = re.compile(r'doi\.org/(10\.\d{4,9}/\S+)', re.IGNORECASE)
+# Version, format and landing-page suffixes publishers append after a DOI in their URL paths
+_DOI_PATH_SUFFIX_RE = re.compile(r'(?:v\d+)?(?:\.full)?(?:\.(?:pdf|html?))?'
+                                 r'(?:/(?:abstract|full|pdf|epdf|references|summary))?$', re.IGNORECASE)
+
+# Patterns to find abstract-like text in the PDF
+_ABSTRACT_RE = re.compile(r'Abstract[:.]?\s*(.+?)(?=\n\n|\n[A-Z]|$)',  # Look for 'Abstract:' or 'Abstract.'
+                          re.IGNORECASE | re.MULTILINE | re.DOTALL)
+_BOUNDARY_RE = re.compile(r'\b(?:Introduction|References)\b', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+ABSTRACT_SEARCH_CHARS = 20000
+
+# Class names of HTML elements likely to hold an abstract
+_ABSTRACT_CLS_RE = re.compile('abstract|description', re.IGNORECASE)
+
+# Static parts of the HTML report; one table row per source goes in between
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Extracted Research Papers</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f4f4f4; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        tr:hover { background-color: #f1f1f1; }
+        a { color: #007BFF; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <h1>Extracted Research Papers</h1>
+    <table>
+        <thead>
+            <tr>
+                <th>Index</th>
+                <th>Name of the Paper</th>
+                <th>Abstract</th>
+                <th>Link</th>
+            </tr>
+        </thead>
+        <tbody>
+"""
+HTML_TAIL = """        </tbody>
+    </table>
+</body>
+</html>
+"""
+
+
+def normalize_url(url):
+    """
+    Normalize a URL for use as a cache key
+    """
+    parts = urlparse(url.rstrip('.'))
+    return parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()).geturl()
+
+
+def guess_encoding(raw, declared=None):
+    """
+    Pick the encoding of a partially read page: the Content-Type charset,
+    else the one declared in the page's <meta> tags, else UTF-8;
+    names Python does not know are ignored
+    """
+    candidates = [declared]
+    match = _META_CHARSET_RE.search(raw[:4096])
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+
+    # Bogus declarations (charset=none, utf8mb4, ...) are skipped like aiohttp's text() does
+    for encoding in candidates:
+        if encoding:
+            try:
+                return codecs.lookup(encoding).name
+            except LookupError:
+                pass
+    return 'utf-8'
+
+
+def link_doi(link):
+    """
+    Return the DOI a link points at, or None. The DOI must end the URL path once
+    known suffixes (.pdf, .full, vN, /abstract, ...) are trimmed, so links to
+    files or pages below a DOI are not mistaken for the DOI itself.
+    """
+    path = urlparse(link if '://' in link else f"https://{link}").path.rstrip('/')
+    match = _DOI_RE.search(path)
+    if not match or match.end() != len(path):
+        return None
+    return _DOI_PATH_SUFFIX_RE.sub('', match.group(), count=1)
+
+
+def canonical_source(source):
+    """
+    Map a link, DOI or arXiv reference to a key shared by all spellings of the same paper:
+    'arxiv:<id>', 'doi:<doi>' or a normalized URL
+    """
+    if source.startswith('arXiv:'):
+        return f"arxiv:{source.split(':')[-1]}"
+
+    match = _ARXIV_URL_RE.search(source)
+    if match:
+        return f"arxiv:{match.group(1)}"
+
+    match = _DOI_URL_RE.search(source)
+    if match:
+        return f"doi:{match.group(1).lower()}"
+
+    if _DOI_RE.fullmatch(source):
+        return f"doi:{source.lower()}"
+
+    # DOIs ending the path of publisher links such as dl.acm.org/doi/10.1145/...
+    doi = link_doi(source)
+    if doi:
+        return f"doi:{doi.lower()}"
+
+    if source.startswith('www.'):
+        source = f"https://{source}"
+    return normalize_url(source)
+
+
+def source_url(key):
+    """
+    Return the URL to fetch for a canonical source key
+    """
+    if key.startswith('arxiv:'):
+        return f"https://arxiv.org/abs/{key[len('arxiv:'):]}"
+    if key.startswith('doi:'):
+        return f"https://doi.org/{key[len('doi:'):]}"
+    return key
+
+
+# Values returned by the title lookups when no real title was found
+_TITLE_PLACEHOLDERS = (
+    "Unknown Title",
+    "Title not available",
+    "Title retrieval error",
+    "Abstract not found through APIs",
+    "Abstract extraction failed",
+)
+
+
+def is_real_title(title, source):
+    """
+    Tell whether a looked-up title is worth searching the APIs for,
+    rather than a placeholder or the tail of the source URL
+    """
+    return (bool(title)
+            and title not in _TITLE_PLACEHOLDERS
+            and not title.startswith(("ArXiv Paper ID:", "DOI Reference:"))
+            and title != source.split('/')[-1])
+
+
+# HTML parsers are module-level functions so they can be sent to the process pool
+
+def parse_abstract_page(html):
+    """
+    Find an abstract in a generic webpage
+    """
+    tree = HTMLParser(html)
+
+    # Try different abstract extraction methods: meta description,
+    # then the first div and the first p with an abstract-like class
+    meta = tree.css_first('meta[name="description"]')
+    abstract_candidates = [meta.attributes.get('content') if meta else None]
+    for tag in ('div', 'p'):
+        node = next((node for node in tree.css(tag)
+                     if _ABSTRACT_CLS_RE.search(node.attributes.get('class') or '')), None)
+        abstract_candidates.append(node.text() if node else None)
+
+    for abstract in abstract_candidates:
+        if abstract and len(abstract) > 50:
+            return abstract.strip()
+
+    return "Abstract not found"
+
+
+def parse_arxiv_page(html):
+    """
+    Find the title and abstract in an arXiv abstract page
+    """
+    tree = HTMLParser(html)
+
+    # Extract title
+    title_tag = tree.css_first('h1.title')
+    if title_tag:
+        title_text = title_tag.text().replace('Title:', '').strip()
+    else:
+        title_text = "Title not available"
+
+    # Extract abstract
+    abstract_block = tree.css_first('blockquote.abstract')
+    if abstract_block:
+        abstract_text = abstract_block.text().replace('Abstract:', '').strip()
+    else:
+        abstract_text = "Abstract not available"
+
+    return title_text, abstract_text
+
+
+def parse_page_title(html):
+    """
+    Return the <title> of a webpage, or None if it has none
+    """
+    title_tag = HTMLParser(html).css_first('title')
+    if title_tag and title_tag.text().strip():
+        return title_tag.text().strip()
+    return None
+
+
+class ResponseCache:
+    def __init__(self, path, expire_after=CACHE_EXPIRE_AFTER):
+        """
+        Open (or create) an SQLite cache of response bodies keyed on normalized URL
+        """
+        self.expire_after = expire_after
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, body TEXT, fetched_at REAL)")
+
+    def get(self, url):
+        """
+        Return the cached body for a URL, or None if missing or expired
+        """
+        row = self.conn.execute("SELECT body, fetched_at FROM responses WHERE url = ?",
+                                (normalize_url(url),)).fetchone()
+        if row and time.time() - row[1] < self.expire_after:
+            return row[0]
+        return None
+
+    def set(self, url, body):
+        """
+        Store the body of a successful response
+        """
+        self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                          (normalize_url(url), body, time.time()))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
 class PDFLinkExtractor:
     def __init__(self, input_pdf_path, output_pdf_path):
         """
@@ -17,6 +308,16 @@ class PDFLinkExtractor:
         self.input_pdf_path = input_pdf_path
         self.output_pdf_path = output_pdf_path
         self.metadata = {}
+        self.pdf_links = []
+        self._titles = {}
+
+        # Shared HTTP state, only set while _run() is active
+        self._session = None
+        self._per_host = None
+        self._host_locks = None
+        self._last_hit = None
+        self._cache = None
+        self._pool = None
 
         # Configure logging
         logging.basicConfig(level=logging.INFO,
@@ -25,14 +326,18 @@ class PDFLinkExtractor:
 
     def extract_text_from_pdf(self):
         """
-        Extract text from PDF file
+        Extract text from PDF file, collecting embedded hyperlinks along the way
         """
         try:
-            with open(self.input_pdf_path, 'rb') as file:
-                reader = PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
+            parts = []
+            with fitz.open(self.input_pdf_path) as doc:
+                for page in doc:
+                    parts.append(page.get_text())
+                    # Web hyperlinks attached to the page, whose targets may not appear in the text;
+                    # mailto:, file: and other schemes are not papers and are skipped
+                    self.pdf_links.extend(link['uri'] for link in page.get_links()
+                                          if link.get('uri', '').startswith(('http://', 'https://')))
+            text = "\n".join(parts)
             logging.info(f"Successfully extracted text from {self.input_pdf_path}")
             return text
         except Exception as e:
@@ -43,52 +348,110 @@ class PDFLinkExtractor:
         """
         Extract links, DOIs, and arXiv references from the text
         """
-        # Comprehensive link extraction patterns
-        link_patterns = [
-            r'https?://[^\s]+',  # Basic HTTP/HTTPS links
-            r'www\.[^\s]+',  # Links starting with www
-            r'doi\.org/[^\s]+'  # DOI links
-        ]
+        # Dicts act as insertion-ordered sets, keeping sources in document order
+        links, dois, arxiv_ids = {}, {}, {}
+        buckets = {'link': links, 'www': links, 'doi_link': links, 'doi': dois, 'arxiv': arxiv_ids}
 
-        # DOI pattern
-        doi_pattern = r'10\.\d{4,9}/[-._;()/:A-Za-z0-9]+'
+        # Sort every match into its bucket, cleaning surrounding punctuation
+        for match in _SOURCE_RE.finditer(text):
+            buckets[match.lastgroup][match.group().strip(',.()[]')] = None
 
-        # arXiv pattern
-        arxiv_pattern = r'arXiv:\d{4}\.\d{4,5}'
+        # Embedded hyperlinks found while reading the PDF
+        links.update(dict.fromkeys(self.pdf_links))
 
-        links = []
-        dois = []
-        arxiv_ids = []
+        # DOIs embedded in links (doi.org, dl.acm.org/doi/..., link.springer.com/article/...),
+        # which the single pass consumed as part of the link
+        for link in links:
+            doi = link_doi(link)
+            if doi:
+                dois[doi] = None
 
-        # Extract links
-        for pattern in link_patterns:
-            links.extend(re.findall(pattern, text))
+        links, dois, arxiv_ids = list(links), list(dois), list(arxiv_ids)
 
-        # Extract DOIs
-        dois = re.findall(doi_pattern, text)
+        logging.info(f"Extracted {len(links)} links, {len(dois)} DOIs, and {len(arxiv_ids)} arXiv IDs")
+        return links, dois, arxiv_ids
 
-        # Extract arXiv IDs
-        arxiv_ids = re.findall(arxiv_pattern, text)
+    async def _run(self, coro_fn, *args):
+        """
+        Run a coroutine method with a shared HTTP session and per-host limits
+        """
+        self._per_host = defaultdict(lambda: asyncio.Semaphore(2))
+        self._host_locks = defaultdict(asyncio.Lock)
+        self._last_hit = defaultdict(lambda: float('-inf'))
+        self._cache = ResponseCache(CACHE_PATH)
+        connector = aiohttp.TCPConnector(limit=50, limit_per_host=2)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            self._session = session
+            try:
+                return await coro_fn(*args)
+            finally:
+                self._session = None
+                self._cache.close()
+                self._cache = None
 
-        # Remove duplicates and clean links
-        links = list(set(link.strip(',.()[]') for link in links))
-        dois = list(set(dois))
-        arxiv_ids = list(set(arxiv_ids))
+    async def _fetch(self, url, headers=None, payload=None, max_bytes=None):
+        """
+        GET a URL, or POST a JSON payload to it, through the shared session, throttled per host.
+        Returns the status code and the decoded body, truncated to max_bytes if given; 200 responses,
+        including empty API results, are served from the cache when present.
+        """
+        cache_key = url if payload is None else f"{url}#{json.dumps(payload, sort_keys=True)}"
+        body = self._cache.get(cache_key)
+        if body is not None:
+            return 200, body
+
+        host = urlparse(url).netloc
+        method = 'GET' if payload is None else 'POST'
+        async with self._per_host[host]:
+            await self._throttle(host)
+            async with self._session.request(method, url, headers=headers, json=payload) as response:
+                status = response.status
+                if max_bytes is None:
+                    body = await response.text()
+                else:
+                    # Stop reading once enough of the page has arrived
+                    raw = bytearray()
+                    while len(raw) < max_bytes:
+                        chunk = await response.content.read(max_bytes - len(raw))
+                        if not chunk:
+                            break
+                        raw += chunk
+                    body = raw.decode(guess_encoding(raw, response.charset), errors='replace')
+
+        if status == 200:
+            self._cache.set(cache_key, body)
+        return status, body
+
+    async def _parse(self, parser, html):
+        """
+        Run an HTML parser function, in the process pool while one is active
+        """
+        if self._pool is None:
+            return parser(html)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, parser, html)
 
-        logging.info(f"Extracted {len(links)} links, {len(dois)} DOIs, and {len(arxiv_ids)} arXiv IDs")
-        return links, dois, arxiv_ids
+    async def _throttle(self, host):
+        """
+        Wait until the host's minimum interval since its previous request has passed
+        """
+        async with self._host_locks[host]:
+            wait = HOST_DELAYS.get(host, DEFAULT_HOST_DELAY) - (time.monotonic() - self._last_hit[host])
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_hit[host] = time.monotonic()
 
-    def extract_abstract_alternative(self, title):
+    async def extract_abstract_alternative(self, title):
         """
         Alternative method to extract abstract using multiple APIs
         """
         try:
             # Try Crossref API
-            crossref_url = f"https://api.crossref.org/works?query={requests.utils.quote(title)}&rows=1"
-            crossref_response = requests.get(crossref_url, timeout=10)
+            crossref_url = f"https://api.crossref.org/works?query={quote(title)}&rows=1"
+            status, body = await self._fetch(crossref_url)
 
-            if crossref_response.status_code == 200:
-                data = crossref_response.json()
+            if status == 200:
+                data = json.loads(body)
                 works = data.get('message', {}).get('items', [])
 
                 if works:
@@ -98,11 +461,11 @@ class PDFLinkExtractor:
                         return abstract
 
             # Try Semantic Scholar API
-            semantic_url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={requests.utils.quote(title)}&fields=abstract"
-            semantic_response = requests.get(semantic_url, timeout=10)
+            semantic_url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={quote(title)}&fields=abstract"
+            status, body = await self._fetch(semantic_url)
 
-            if semantic_response.status_code == 200:
-                data = semantic_response.json()
+            if status == 200:
+                data = json.loads(body)
                 papers = data.get('data', [])
 
                 if papers and papers[0].get('abstract'):
@@ -114,7 +477,7 @@ class PDFLinkExtractor:
             logging.error(f"Alternative abstract extraction error: {e}")
             return "Abstract extraction failed"
 
-    def extract_abstract_from_url(self, url):
+    async def extract_abstract_from_url(self, url):
         """
         Try to extract abstract from webpage
         """
@@ -124,27 +487,12 @@ class PDFLinkExtractor:
                 'Accept-Language': 'en-US,en;q=0.9'
             }
 
-            response = requests.get(url, headers=headers, timeout=10)
+            status, html = await self._fetch(url, headers=headers, max_bytes=MAX_HTML_BYTES)
 
-            if response.status_code != 200:
+            if status != 200:
                 return "Abstract not available"
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Try different abstract extraction methods
-            abstract_candidates = [
-                soup.find('meta', attrs={'name': 'description'}),
-                soup.find('div', class_=re.compile('abstract|description', re.IGNORECASE)),
-                soup.find('p', class_=re.compile('abstract|description', re.IGNORECASE))
-            ]
-
-            for candidate in abstract_candidates:
-                if candidate:
-                    abstract = candidate.get('content', candidate.text)
-                    if abstract and len(abstract) > 50:
-                        return abstract.strip()
-
-            return "Abstract not found"
+            return await self._parse(parse_abstract_page, html)
 
         except Exception as e:
             logging.error(f"URL abstract extraction error for {url}: {e}")
@@ -154,94 +502,165 @@ class PDFLinkExtractor:
         """
         Extract potential abstract from PDF text
         """
-        # Regex patterns to find abstract-like text
-        abstract_patterns = [
-            r'Abstract[:.]?\s*(.+?)(?=\n\n|\n[A-Z]|$)',  # Look for 'Abstract:' or 'Abstract.'
-            r'((?:(?!Introduction|References)[\s\S]){50,500})',  # Large text block before Introduction
-        ]
+        # The abstract is always on the first page, so only search its opening
+        text = text[:ABSTRACT_SEARCH_CHARS]
 
-        for pattern in abstract_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            if matches:
-                # Take the first match and clean it
-                abstract = matches[0]
-                if isinstance(abstract, tuple):
-                    abstract = abstract[0]
+        match = _ABSTRACT_RE.search(text)
+        if match:
+            # Take the first match and clean it
+            abstract = _WS_RE.sub(' ', match.group(1)).strip()[:2000]
 
-                # Clean up the abstract
-                abstract = re.sub(r'\s+', ' ', abstract).strip()
+            if len(abstract) > 50:
+                return abstract
 
-                if len(abstract) > 50:
-                    return abstract
+        # Fall back to the text block just before Introduction/References
+        boundary = _BOUNDARY_RE.search(text)
+        candidate = text[:boundary.start()][-500:] if boundary else text[:500]
+        abstract = _WS_RE.sub(' ', candidate).strip()
+
+        if len(abstract) > 50:
+            return abstract
 
         return "No abstract found in text"
 
-    def extract_abstract_from_arxiv(self, url):
+    async def extract_abstract_from_arxiv(self, url):
         """
         Extract the title and abstract specifically for ArXiv papers
         """
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract title
-            title_tag = soup.find('h1', class_='title')
-            if title_tag:
-                title_text = title_tag.text.replace('Title:', '').strip()
-            else:
-                title_text = "Title not available"
-
-            # Extract abstract
-            abstract_block = soup.find('blockquote', class_='abstract')
-            if abstract_block:
-                abstract_text = abstract_block.text.replace('Abstract:', '').strip()
-            else:
-                abstract_text = "Abstract not available"
+            status, html = await self._fetch(url)
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
 
-            return title_text, abstract_text
+            return await self._parse(parse_arxiv_page, html)
 
         except Exception as e:
             logging.error(f"Failed to retrieve metadata from {url}: {e}")
             return "Title retrieval error", "Abstract retrieval error"
 
-    def process_links_and_dois(self, text, links, dois, arxiv_ids):
-        for source in list(links) + list(dois) + list(arxiv_ids):
+    async def process_links_and_dois(self, text, links, dois, arxiv_ids):
+        """
+        Fetch titles and abstracts for all sources concurrently, once per distinct paper
+        """
+        sources = list(links) + list(dois) + list(arxiv_ids)
+        canonical = {source: canonical_source(source) for source in sources}
+
+        keys = list(dict.fromkeys(canonical.values()))
+        fetched = await self.lookup_batch(keys)
+
+        # Scrape only the papers the batch lookup could not resolve
+        remaining = [key for key in keys if key not in fetched]
+        done = 0
+
+        async def process_with_progress(key):
+            nonlocal done
+            result = await self.process_source(text, source_url(key))
+            done += 1
+            loading_bar(len(remaining), done)
+            return result
+
+        # Parse in worker processes for large batches so fetching is not held up by the GIL
+        if len(remaining) > PARSE_POOL_THRESHOLD:
+            self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        try:
+            results = await asyncio.gather(*(process_with_progress(key) for key in remaining))
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        if remaining:
+            print()
+        fetched.update(zip(remaining, results))
+
+        # Every spelling of a paper shares the same entry
+        for source in sources:
+            self.metadata[source] = fetched[canonical[source]]
+
+    async def lookup_batch(self, keys):
+        """
+        Look up arXiv IDs and DOIs with Semantic Scholar's batch endpoint.
+        Returns metadata for the canonical keys that were found with an abstract.
+        """
+        paper_ids = {}
+        for key in keys:
+            if key.startswith('arxiv:'):
+                paper_ids[f"ARXIV:{key[len('arxiv:'):]}"] = key
+            elif key.startswith('doi:'):
+                paper_ids[f"DOI:{key[len('doi:'):]}"] = key
+
+        found = {}
+        ids = list(paper_ids)
+        for start in range(0, len(ids), SEMANTIC_BATCH_SIZE):
+            chunk = ids[start:start + SEMANTIC_BATCH_SIZE]
             try:
-                time.sleep(0.5)  # Throttle requests
+                status, body = await self._fetch(SEMANTIC_BATCH_URL, payload={'ids': chunk})
+                if status != 200:
+                    logging.warning(f"Semantic Scholar batch lookup returned HTTP {status}")
+                    continue
+
+                # Results are returned in request order, with null for unknown IDs
+                for paper_id, paper in zip(chunk, json.loads(body)):
+                    if not paper:
+                        continue
+                    key = paper_ids[paper_id]
+                    if paper.get('abstract'):
+                        found[key] = {
+                            'title': paper.get('title') or 'Unknown Title',
+                            'abstract': paper['abstract']
+                        }
+                    elif paper.get('title'):
+                        # Known paper without an abstract: it will be scraped, but keep the real title
+                        self._titles[source_url(key)] = paper['title']
 
-                # For ArXiv references
-                if source.startswith('arXiv:'):
-                    arxiv_id = source.split(':')[-1]
-                    url = f"https://arxiv.org/abs/{arxiv_id}"
-                    title, abstract = self.extract_abstract_from_arxiv(url)
+            except Exception as e:
+                logging.error(f"Semantic Scholar batch lookup error: {e}")
 
-                elif "arxiv.org" in source:
-                    title, abstract = self.extract_abstract_from_arxiv(source)
+        logging.info(f"Batch lookup resolved {len(found)} of {len(ids)} DOIs and arXiv IDs")
+        return found
 
-                elif source.startswith(('http', 'doi.org', 'www.')):
-                    abstract = self.extract_abstract_from_url(source)
-                    title = self.extract_title_from_url(source)
+    async def process_source(self, text, source):
+        """
+        Fetch the title and abstract for a single link, DOI or arXiv ID
+        """
+        try:
+            # For ArXiv references
+            if source.startswith('arXiv:'):
+                arxiv_id = source.split(':')[-1]
+                url = f"https://arxiv.org/abs/{arxiv_id}"
+                title, abstract = await self.extract_abstract_from_arxiv(url)
 
-                if not abstract:
-                    title = self.extract_title_from_url(source)
-                    abstract = self.extract_abstract_alternative(title)
+            elif "arxiv.org" in source:
+                title, abstract = await self.extract_abstract_from_arxiv(source)
 
-                if not abstract:
-                    abstract = self.extract_abstract_from_text(text)
+            elif source.startswith(('http', 'doi.org', 'www.')):
+                abstract = await self.extract_abstract_from_url(source)
+                title = await self.extract_title_from_url(source)
 
-                self.metadata[source] = {
-                    'title': title,
-                    'abstract': abstract
-                }
+            else:
+                raise ValueError("not a fetchable link, DOI or arXiv ID")
+
+            if not abstract:
+                title = await self.extract_title_from_url(source)
+                # Searching the APIs for a placeholder would return some unrelated paper
+                if not is_real_title(title, source):
+                    raise ValueError(f"no usable title to search for: {title}")
+                abstract = await self.extract_abstract_alternative(title)
+
+            if not abstract:
+                abstract = self.extract_abstract_from_text(text)
+
+            # The title is stored so the reports never need to fetch it again
+            return {
+                'title': title or source,
+                'abstract': abstract
+            }
 
-            except Exception as e:
-                logging.error(f"Failed processing source {source}: {e}")
-                self.metadata[source] = {
-                    'abstract': 'Failed to get Abstract',
-                    'title': 'Unknown Title'
-                }
+        except Exception as e:
+            logging.error(f"Failed processing source {source}: {e}")
+            return {
+                'abstract': 'Failed to get Abstract',
+                'title': 'Unknown Title'
+            }
 
     def create_output_pdf(self):
         """
@@ -253,6 +672,13 @@ class PDFLinkExtractor:
                 print("No links or abstracts found to generate PDF.")
                 return
 
+            # Prepare every row's text up front so the emit loop only draws
+            entries = []
+            for idx, (source, info) in enumerate(self.metadata.items(), start=1):
+                truncated_source = source[:100] + '...' if len(source) > 100 else source
+                abstract = info.get('abstract', 'No abstract available')
+                entries.append((f"{idx}. Source: {truncated_source}", f"Abstract: {abstract[:500]}..."))
+
             pdf = FPDF()
             pdf.set_auto_page_break(auto=True, margin=15)
             pdf.add_page()
@@ -264,12 +690,9 @@ class PDFLinkExtractor:
             pdf.cell(0, 10, txt="Extracted Links, Titles, and Abstracts", ln=True, align='C')
             pdf.ln(10)
 
-            for idx, (source, info) in enumerate(self.metadata.items(), start=1):
-                truncated_source = source[:100] + '...' if len(source) > 100 else source
-                pdf.cell(0, 10, txt=f"{idx}. Source: {truncated_source}", ln=True)
-
-                abstract = info.get('abstract', 'No abstract available')
-                pdf.multi_cell(0, 10, txt=f"Abstract: {abstract[:500]}...", align='L')
+            for source_line, abstract_text in entries:
+                pdf.cell(0, 10, txt=source_line, ln=True)
+                pdf.multi_cell(0, 10, txt=abstract_text, align='L')
                 pdf.ln(5)
 
             pdf.output(self.output_pdf_path)
@@ -296,64 +719,28 @@ class PDFLinkExtractor:
                 print("No metadata found to generate HTML.")
                 return
 
-            # Start HTML content
-            html_content = """
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Extracted Research Papers</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    table { width: 100%; border-collapse: collapse; margin-top: 20px; }
-                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                    th { background-color: #f4f4f4; }
-                    tr:nth-child(even) { background-color: #f9f9f9; }
-                    tr:hover { background-color: #f1f1f1; }
-                    a { color: #007BFF; text-decoration: none; }
-                    a:hover { text-decoration: underline; }
-                </style>
-            </head>
-            <body>
-                <h1>Extracted Research Papers</h1>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Index</th>
-                            <th>Name of the Paper</th>
-                            <th>Abstract</th>
-                            <th>Link</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-
             # Add rows for each paper
+            rows = []
             for idx, (source, info) in enumerate(self.metadata.items(), start=1):
-                name = self.extract_title_from_url(source)
-                abstract = info.get('abstract', 'No abstract available')
+                title = info.get('title')
+                # Placeholders such as "Unknown Title" are replaced by the source itself
+                name = escape(title if is_real_title(title, source) else source)
+                abstract = escape(info.get('abstract', 'No abstract available')[:500])
+                source = escape(source, quote=True)
                 link = f"<a href='{source}' target='_blank'>{source}</a>"
-                html_content += f"""
-                    <tr>
-                        <td>{idx}</td>
-                        <td>{name}</td>
-                        <td>{abstract[:500]}...</td>
-                        <td>{link}</td>
-                    </tr>
-                """
-
-            # End HTML content
-            html_content += """
-                    </tbody>
-                </table>
-            </body>
-            </html>
-            """
+                rows.append(f"""            <tr>
+                <td>{idx}</td>
+                <td>{name}</td>
+                <td>{abstract}...</td>
+                <td>{link}</td>
+            </tr>
+""")
 
             # Write HTML to file
             with open(html_output_path, 'w', encoding='utf-8') as html_file:
-                html_file.write(html_content)
+                html_file.write(HTML_HEAD)
+                html_file.writelines(rows)
+                html_file.write(HTML_TAIL)
 
             logging.info(f"Output HTML created at {html_output_path}")
             print(f"HTML successfully generated at {html_output_path}")
@@ -362,20 +749,29 @@ class PDFLinkExtractor:
             logging.error(f"Unexpected error in HTML creation: {e}")
             print(f"Unexpected error: {e}")
 
-    def extract_title_from_url(self, url):
+    async def extract_title_from_url(self, url):
         """
         Extract a title from the URL or webpage if metadata is present.
+        Titles are remembered per URL, so repeated calls cost nothing.
+        """
+        if url not in self._titles:
+            self._titles[url] = await self._fetch_title(url)
+        return self._titles[url]
+
+    async def _fetch_title(self, url):
+        """
+        Look up the title for a URL, see extract_title_from_url
         """
         try:
             # Handle ArXiv URLs
             if 'arxiv.org' in url:
                 arxiv_id = url.split('/')[-1]
-                title, _ = self.extract_abstract_from_arxiv(url)  # Fetch title directly from arXiv page
+                title, _ = await self.extract_abstract_from_arxiv(url)  # Fetch title directly from arXiv page
                 return title if title != "Title not available" else f"ArXiv Paper ID: {arxiv_id}"
 
             # Handle DOI URLs
             elif 'doi.org' in url:
-                title = self.extract_abstract_alternative(url)  # Use DOI to fetch title via alternative method
+                title = await self.extract_abstract_alternative(url)  # Use DOI to fetch title via alternative method
                 return title if title != "Abstract extraction failed" else f"DOI Reference: {url.split('/')[-1]}"
 
             # For general sources, try to fetch the title from the webpage
@@ -384,12 +780,11 @@ class PDFLinkExtractor:
                 'Accept-Language': 'en-US,en;q=0.9'
             }
 
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                title_tag = soup.find('title')
-                if title_tag and title_tag.text.strip():
-                    return title_tag.text.strip()
+            status, html = await self._fetch(url, headers=headers, max_bytes=MAX_HTML_BYTES)
+            if status == 200:
+                title = await self._parse(parse_page_title, html)
+                if title:
+                    return title
 
             # Fallback to last part of the URL if no title found
             return url.split('/')[-1]
@@ -410,7 +805,7 @@ class PDFLinkExtractor:
             links, dois, arxiv_ids = self.extract_links_and_dois(text)
 
             # Process links, DOIs, and arXiv IDs
-            self.process_links_and_dois(text, links, dois, arxiv_ids)
+            asyncio.run(self._run(self.process_links_and_dois, text, links, dois, arxiv_ids))
 
             # Create output PDF
             self.create_output_pdf()
@@ -445,10 +840,6 @@ if __name__ == "__main__":
     input_pdf_path = input("write the name of research paper you want")  # Replace with your PDF path
     output_pdf_path = "extracted_links_and_abstracts.pdf"
 
-    total_steps = 100
-    for i in range(total_steps + 1):
-        loading_bar(total_steps, i)
-        time.sleep(0.1)
+    print("Extracting references...", flush=True)
     extractor = PDFLinkExtractor(input_pdf_path, output_pdf_path)
     extractor.workflow()  # Changed from run() to workflow()
-    # Simulate work being done